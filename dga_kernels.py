@@ -0,0 +1,130 @@
+"""Optional numba batch kernel for the dga_models rules (ImportError without numba); see test_dga_kernels.py."""
+import numpy as np
+from numba import njit, prange
+
+from dga_models import BATCH_MODELS
+
+# classify_all columns by BATCH_MODELS key; NOT_APPLICABLE marks a gas-group total that is not positive
+KERNEL_MODELS = ('duval_t1', 'duval_t4', 'duval_t5', 'rogers', 'doernenburg', 'pentagon')
+NOT_APPLICABLE = -1
+
+_RATIO_FALLBACK = 99.0
+# Rogers digit limits (R1, R2, R5): digit = (ratio >= low) + (ratio > high)
+_ROGERS_LIMITS = ((0.1, 1.0), (1.0, 3.0), (0.5, 3.0))
+
+
+@njit(inline='always')
+def _ratio(numerator, denominator):
+    return numerator / denominator if denominator > 0 else _RATIO_FALLBACK
+
+
+@njit(inline='always')
+def _percent(value, total):
+    return (value / total) * 100.0 if total > 0 else 0.0
+
+
+@njit(inline='always')
+def _rogers_digit(ratio, low, high):
+    return (1 if ratio >= low else 0) + (1 if ratio > high else 0)
+
+
+@njit(parallel=True, cache=True)
+def classify_all(gases):
+    """Classifies (N, 6) GAS_COLUMNS ppm rows into an (N, 6) int64 array of label indices, one column per KERNEL_MODELS entry."""
+    n = gases.shape[0]
+    codes = np.empty((n, 6), dtype=np.int64)
+    for i in prange(n):
+        H2, CH4, C2H4, C2H2, C2H6 = gases[i, 0], gases[i, 1], gases[i, 2], gases[i, 3], gases[i, 5]
+
+        # Duval T1 / T5 (CH4, C2H4, C2H2)
+        t1_total = CH4 + C2H4 + C2H2
+        p_ch4, p_c2h4, p_c2h2 = _percent(CH4, t1_total), _percent(C2H4, t1_total), _percent(C2H2, t1_total)
+        if not (t1_total > 0):
+            codes[i, 0] = NOT_APPLICABLE
+            codes[i, 2] = NOT_APPLICABLE
+        else:
+            if p_c2h2 < 0.5 and p_ch4 > 80:
+                codes[i, 0] = 0  # T1
+            elif p_c2h4 > 25 and p_c2h2 < 1:
+                codes[i, 0] = 1  # T2
+            elif p_c2h2 > 5 and p_c2h4 > 15:
+                codes[i, 0] = 2  # D2
+            elif p_c2h4 > 50 and p_c2h2 < 2:
+                codes[i, 0] = 3  # T3
+            else:
+                codes[i, 0] = 4
+
+            if p_c2h4 > 50 and p_ch4 > 40:
+                codes[i, 2] = 0  # HC
+            elif p_ch4 > 70 and p_c2h4 < 10:
+                codes[i, 2] = 1  # T1
+            elif p_c2h4 > 30 and p_c2h2 < 1:
+                codes[i, 2] = 2  # T2
+            else:
+                codes[i, 2] = 3
+
+        # Duval T4 (H2, C2H2, C2H4)
+        t4_total = H2 + C2H2 + C2H4
+        if not (t4_total > 0):
+            codes[i, 1] = NOT_APPLICABLE
+        else:
+            p_h2, p_c2h2, p_c2h4 = _percent(H2, t4_total), _percent(C2H2, t4_total), _percent(C2H4, t4_total)
+            if p_h2 > 80 and p_c2h2 < 5:
+                codes[i, 1] = 0  # S
+            elif p_c2h4 > 60 and p_h2 < 10:
+                codes[i, 1] = 1  # T3
+            elif p_c2h2 > 15:
+                codes[i, 1] = 2  # D2
+            else:
+                codes[i, 1] = 3
+
+        # Rogers (R1 = CH4/H2, R2 = C2H4/CH4, R5 = C2H2/C2H4), index d0 * 9 + d1 * 3 + d2
+        r_ch4_h2 = _ratio(CH4, H2)
+        r_c2h2_c2h4 = _ratio(C2H2, C2H4)
+        codes[i, 3] = (
+            _rogers_digit(r_ch4_h2, _ROGERS_LIMITS[0][0], _ROGERS_LIMITS[0][1]) * 9
+            + _rogers_digit(_ratio(C2H4, CH4), _ROGERS_LIMITS[1][0], _ROGERS_LIMITS[1][1]) * 3
+            + _rogers_digit(r_c2h2_c2h4, _ROGERS_LIMITS[2][0], _ROGERS_LIMITS[2][1])
+        )
+
+        # Doernenburg (0 = inconclusive below the gas limits)
+        r_c2h2_ch4 = _ratio(C2H2, CH4)
+        if H2 < 100 or CH4 < 10 or C2H2 < 0.5 or C2H4 < 50:
+            codes[i, 4] = 0
+        elif r_c2h2_c2h4 > 0.3 and r_c2h2_ch4 < 0.7:
+            codes[i, 4] = 1
+        elif r_c2h2_c2h4 < 0.3 and r_ch4_h2 > 1.0:
+            codes[i, 4] = 2
+        else:
+            codes[i, 4] = 3
+
+        # Duval Pentagon (H2, CH4, C2H6, C2H4, C2H2)
+        pent_total = H2 + CH4 + C2H6 + C2H4 + C2H2
+        if not (pent_total > 0):
+            codes[i, 5] = NOT_APPLICABLE
+        else:
+            q_h2, q_ch4, q_c2h6 = _percent(H2, pent_total), _percent(CH4, pent_total), _percent(C2H6, pent_total)
+            q_c2h4, q_c2h2 = _percent(C2H4, pent_total), _percent(C2H2, pent_total)
+            if q_h2 > 40 and q_c2h2 < 10:
+                codes[i, 5] = 0
+            elif q_c2h2 > 30:
+                codes[i, 5] = 1
+            elif q_c2h4 > 50:
+                codes[i, 5] = 2
+            elif q_c2h6 > 40 and q_ch4 < 20:
+                codes[i, 5] = 3
+            elif q_ch4 > 50:
+                codes[i, 5] = 4
+            else:
+                codes[i, 5] = 5
+    return codes
+
+
+def batch_labels_numba(gases):
+    """Label arrays for an (N, 6) GAS_COLUMNS array via classify_all, in BATCH_MODELS order."""
+    codes = classify_all(np.ascontiguousarray(gases, dtype=float))
+    labels = []
+    for key, _, diagnoses, zero_label in BATCH_MODELS:
+        column = codes[:, KERNEL_MODELS.index(key)]
+        labels.append(np.where(column == NOT_APPLICABLE, zero_label, diagnoses[np.maximum(column, 0)]))
+    return labels
@@ -0,0 +1,364 @@
+"""DGA model logic and Duval plot geometry, imported by streamlit_dga_app so it is built once per process."""
+import dataclasses
+import functools
+
+import numpy as np
+
+# --- DGA Model Logic (Based on IEC/IEEE Standards) ---
+
+# 1. Coordinate Conversion for Ternary Plots (Duval)
+SQRT3_HALF = np.sqrt(3) / 2  # Height of the unit equilateral triangle
+
+# Rows are the Cartesian positions of the three ternary corners (P1, P2, P3 at 100%, scaled by 1/100)
+TERNARY_TO_XY = np.array([[0.0, 0.0], [1.0, 0.0], [0.5, SQRT3_HALF]])
+
+def to_cartesian(coords):
+    """Converts normalized (100%) ternary coordinates to Cartesian for plotting: (..., 3) -> (..., 2) array of (x, y)."""
+    return np.asarray(coords, dtype=float) @ TERNARY_TO_XY
+
+# compute_features keys: r_* gas ratios (99 for a zero denominator), p_* group percentages (0 for a zero total)
+FEATURE_NAMES = (
+    'r_ch4_h2', 'r_c2h4_ch4', 'r_c2h2_c2h4', 'r_c2h2_ch4', 'r_c2h2_h2',
+    'p_t1_ch4', 'p_t1_c2h4', 'p_t1_c2h2',
+    'p_t4_h2', 'p_t4_c2h2', 'p_t4_c2h4',
+    'p_pent_h2', 'p_pent_ch4', 'p_pent_c2h6', 'p_pent_c2h4', 'p_pent_c2h2',
+)
+_RATIO_FALLBACK = 99.0
+
+def compute_features_array(H2, CH4, C2H4, C2H2, CO, C2H6):
+    """Returns FEATURE_NAMES and the group totals as arrays; gases may be scalars or equal-length arrays."""
+    H2, CH4, C2H4, C2H2, CO, C2H6 = np.broadcast_arrays(*(np.asarray(g, dtype=float) for g in (H2, CH4, C2H4, C2H2, CO, C2H6)))
+    t1_total = CH4 + C2H4 + C2H2
+    t4_total = H2 + C2H2 + C2H4
+    pent_total = H2 + CH4 + C2H6 + C2H4 + C2H2
+
+    numerators = np.stack([
+        CH4, C2H4, C2H2, C2H2, C2H2,
+        CH4, C2H4, C2H2,
+        H2, C2H2, C2H4,
+        H2, CH4, C2H6, C2H4, C2H2,
+    ])
+    denominators = np.stack([H2, CH4, C2H4, CH4, H2] + [t1_total] * 3 + [t4_total] * 3 + [pent_total] * 5)
+    row_shape = (-1,) + (1,) * H2.ndim
+    scale = np.array([1.0] * 5 + [100.0] * 11).reshape(row_shape)
+    fallback = np.broadcast_to(np.array([_RATIO_FALLBACK] * 5 + [0.0] * 11).reshape(row_shape), numerators.shape).copy()
+
+    values = np.divide(numerators, denominators, out=fallback, where=denominators > 0) * scale
+
+    features = dict(zip(FEATURE_NAMES, values))
+    features.update(t1_total=t1_total, t4_total=t4_total, pent_total=pent_total)
+    return features
+
+@functools.lru_cache(maxsize=128)
+def compute_features(H2, CH4, C2H4, C2H2, CO, C2H6):
+    """Scalar compute_features_array for one gas sample (memoized per process, so treat the dict as read-only)."""
+    return {name: float(value) for name, value in compute_features_array(H2, CH4, C2H4, C2H2, CO, C2H6).items()}
+
+# Gas order of DGAInputs fields, of positional gas arguments and of the batch CSV columns
+GAS_COLUMNS = ['H2', 'CH4', 'C2H4', 'C2H2', 'CO', 'C2H6']
+
+@dataclasses.dataclass(frozen=True)
+class DGAInputs:
+    """Gas concentrations (ppm) for one reading (floats) or a batch (arrays); iterates in GAS_COLUMNS order."""
+    H2: float
+    CH4: float
+    C2H4: float
+    C2H2: float
+    CO: float
+    C2H6: float
+
+    @classmethod
+    def from_columns(cls, gases):
+        """Builds a batch from an (N, 6) array in GAS_COLUMNS order; each gas field is a contiguous column."""
+        return cls(*np.ascontiguousarray(np.asarray(gases, dtype=float).T))
+
+    def __iter__(self):
+        return iter((self.H2, self.CH4, self.C2H4, self.C2H2, self.CO, self.C2H6))
+
+# 2. Diagnostic Functions
+# classify_* evaluate the rule chains on scalar or array features; diagnose_* format one sample's DiagResult.
+
+# Diagnosis labels (object arrays so an index array maps straight to label strings)
+DUVAL_T1_DIAGNOSES = np.array([
+    "T1 (Thermal fault T < 300°C)",
+    "T2 (Thermal fault 300°C–700°C)",
+    "D2 (Arcing in oil)",
+    "T3 (Thermal fault T > 700°C)",
+    "Undefined/Mixed Fault",
+], dtype=object)
+DUVAL_T4_DIAGNOSES = np.array([
+    "S (Stray Gassing / Hot metal contacts)",
+    "T3 (Severe Thermal Fault T > 700°C)",
+    "D2 (High Energy Arcing)",
+    "Mixed or Undefined Region",
+], dtype=object)
+DUVAL_T5_DIAGNOSES = np.array([
+    "HC (Hot cellulosic materials)",
+    "T1 (Thermal T < 300°C - Cellulose/Paper)",
+    "T2 (Thermal T 300°C–770°C)",
+    "Mixed Oil Fault",
+], dtype=object)
+DOERNENBURG_INCONCLUSIVE = "Inconclusive (Gas limits below Doernenburg thresholds)"
+DOERNENBURG_DIAGNOSES = np.array([
+    DOERNENBURG_INCONCLUSIVE,
+    "D1 (Discharge/Arcing)",
+    "T2 (Thermal fault 300°C–700°C)",
+    "Mixed/Other fault",
+], dtype=object)
+PENTAGON_DIAGNOSES = np.array([
+    "PD (Partial Discharge) or D1 (Low Energy Discharge)",
+    "D2 (High Energy Arcing)",
+    "T3 (Severe Thermal Fault T > 700°C)",
+    "T1 (Low Temperature Thermal Fault T < 300°C)",
+    "T2 (Medium Temperature Thermal Fault 300°C–700°C)",
+    "Mixed/Developing Fault Zone (Refer to plot)",
+], dtype=object)
+
+# Rogers np.digitize bins for (R1, R2, R5); upper edges are nudged up one ulp so only ratios above them score 2
+ROGERS_BOUNDS = np.array([[low, np.nextafter(high, np.inf)] for low, high in ((0.1, 1.0), (1.0, 3.0), (0.5, 3.0))])
+
+# Rogers diagnoses indexed by the code digits, ROGERS_CODES[d0, d1, d2]
+ROGERS_CODES = np.full((3, 3, 3), "Undefined/Developing Fault", dtype=object)
+ROGERS_CODES[1, 0, 0] = "T1 (Thermal Fault T < 300°C)"
+ROGERS_CODES[1, 1, 0] = "T2 (Thermal Fault 300°C–700°C)"
+ROGERS_CODES[2, 1, 0] = "T3 (Thermal Fault T > 700°C)"
+ROGERS_CODES[1, 0, 2] = "D1 (Low Energy Discharge/PD)"
+ROGERS_CODES[0, 0, 1] = "D2 (High Energy Discharge/Arcing)"
+ROGERS_CODES[0, 0, 0] = "No fault / Normal aging"
+ROGERS_CODES[0, 1, 0] = "Undefined/Mixed thermal"
+ROGERS_CODES[0, 1, 1] = "Undefined/Mixed thermal"
+ROGERS_CODES[1, 1, 1] = "Mixed thermal and electrical"
+
+def _first_match(conditions, labels):
+    """Returns labels[i] for the first true condition per sample, or labels[-1] when none match."""
+    return labels[np.select(conditions, np.arange(len(conditions)), default=len(conditions))]
+
+def _threshold_halfplanes(rules, n_vars=3):
+    """Builds an (R, E, n_vars + 1) half-plane array from (variable index, '<' or '>', limit) edge rules."""
+    n_edges = max(len(rule) for rule in rules)
+    halfplanes = np.zeros((len(rules), n_edges, n_vars + 1))
+    halfplanes[:, :, -1] = 1.0
+    for r, rule in enumerate(rules):
+        for e, (var, op, limit) in enumerate(rule):
+            sign = 1.0 if op == '>' else -1.0
+            halfplanes[r, e, var] = sign
+            halfplanes[r, e, -1] = -sign * limit
+    return halfplanes
+
+def _classify_halfplanes(halfplanes, labels, P1, P2, P3):
+    """Labels ternary points by their first containing region (labels[-1] when none contains them)."""
+    point = np.stack(np.broadcast_arrays(P1, P2, P3, 1.0)).astype(float)
+    inside = (np.einsum('rec,c...->re...', halfplanes, point) > 0).all(axis=1)
+    return labels[np.where(inside.any(axis=0), inside.argmax(axis=0), len(halfplanes))]
+
+# Duval triangle regions in rule priority order; T1 / T5 points are (CH4, C2H4, C2H2), T4 points are (H2, C2H2, C2H4)
+DUVAL_T1_HALFPLANES = _threshold_halfplanes([
+    [(2, '<', 0.5), (0, '>', 80)],  # T1 (common boundaries P_C2H2 < 0.5, P_CH4 > 80)
+    [(1, '>', 25), (2, '<', 1)],    # T2
+    [(2, '>', 5), (1, '>', 15)],    # D2
+    [(1, '>', 50), (2, '<', 2)],    # T3
+])
+DUVAL_T4_HALFPLANES = _threshold_halfplanes([
+    [(0, '>', 80), (1, '<', 5)],    # S
+    [(2, '>', 60), (0, '<', 10)],   # T3
+    [(1, '>', 15)],                 # D2
+])
+DUVAL_T5_HALFPLANES = _threshold_halfplanes([
+    [(1, '>', 50), (0, '>', 40)],   # HC
+    [(0, '>', 70), (1, '<', 10)],   # T1
+    [(1, '>', 30), (2, '<', 1)],    # T2
+])
+
+def classify_duval_t1(P_CH4, P_C2H4, P_C2H2):
+    """Duval T1 region labels for normalized CH4/C2H4/C2H2 percentages."""
+    return _classify_halfplanes(DUVAL_T1_HALFPLANES, DUVAL_T1_DIAGNOSES, P_CH4, P_C2H4, P_C2H2)
+
+def classify_duval_t4(P_H2, P_C2H2, P_C2H4):
+    """Duval T4 region labels for normalized H2/C2H2/C2H4 percentages."""
+    return _classify_halfplanes(DUVAL_T4_HALFPLANES, DUVAL_T4_DIAGNOSES, P_H2, P_C2H2, P_C2H4)
+
+def classify_duval_t5(P_CH4, P_C2H4, P_C2H2):
+    """Duval T5 region labels for normalized CH4/C2H4/C2H2 percentages (Focus on T2, C, HC)."""
+    return _classify_halfplanes(DUVAL_T5_HALFPLANES, DUVAL_T5_DIAGNOSES, P_CH4, P_C2H4, P_C2H2)
+
+def classify_rogers(R1, R2, R5):
+    """Rogers code digits (shape (3, ...)) and diagnosis labels for the R1, R2, R5 ratios."""
+    digits = np.stack([np.digitize(ratio, bins) for bins, ratio in zip(ROGERS_BOUNDS, (R1, R2, R5))])
+    return digits, ROGERS_CODES[tuple(digits)]
+
+def classify_doernenburg(H2, CH4, C2H4, C2H2, R_ch4_h2, R_c2h2_c2h4, R_c2h2_ch4):
+    """Doernenburg labels; DOERNENBURG_INCONCLUSIVE where the gas levels are below the method's limits."""
+    return _first_match([
+        # Doernenburg only applicable if certain gas levels are met (simplified condition here)
+        (H2 < 100) | (CH4 < 10) | (C2H2 < 0.5) | (C2H4 < 50),
+        # Simplified Diagnosis Logic
+        (R_c2h2_c2h4 > 0.3) & (R_c2h2_ch4 < 0.7),
+        (R_c2h2_c2h4 < 0.3) & (R_ch4_h2 > 1.0),
+    ], DOERNENBURG_DIAGNOSES)
+
+# Duval Pentagon rules as exclusive (lower, upper) boxes over (H2, CH4, C2H6, C2H4, C2H2) percentages
+_ANY = (-np.inf, np.inf)
+PENTAGON_BOUNDS = np.array([
+    [(40, np.inf), _ANY, _ANY, _ANY, (-np.inf, 10)],  # PD / D1
+    [_ANY, _ANY, _ANY, _ANY, (30, np.inf)],           # D2
+    [_ANY, _ANY, _ANY, (50, np.inf), _ANY],           # T3
+    [_ANY, (-np.inf, 20), (40, np.inf), _ANY, _ANY],  # T1
+    [_ANY, (50, np.inf), _ANY, _ANY, _ANY],           # T2
+])
+
+def _classify_boxes(bounds, labels, *values):
+    """Labels samples by the first (lower, upper) box containing them (labels[-1] when none does)."""
+    point = np.stack(np.broadcast_arrays(*values)).astype(float)
+    lower, upper = (bounds[..., i].reshape(bounds.shape[:2] + (1,) * (point.ndim - 1)) for i in (0, 1))
+    inside = ((point > lower) & (point < upper)).all(axis=1)
+    return labels[np.where(inside.any(axis=0), inside.argmax(axis=0), len(bounds))]
+
+def classify_pentagon(P_H2, P_CH4, P_C2H6, P_C2H4, P_C2H2):
+    """Duval Pentagon labels for normalized pentagon gas percentages."""
+    return _classify_boxes(PENTAGON_BOUNDS, PENTAGON_DIAGNOSES, P_H2, P_CH4, P_C2H6, P_C2H4, P_C2H2)
+
+@dataclasses.dataclass(frozen=True)
+class DiagResult:
+    """One model's diagnosis: the bare label, the summary text, and the ratios it was based on."""
+    label: str
+    detail: str
+    ratios: dict = dataclasses.field(default_factory=dict)
+
+NOT_APPLICABLE = "Not Applicable (Total gas is zero)"
+PENTAGON_NOT_APPLICABLE = "Not Applicable (Total pentagon gases is zero)"
+
+def diagnose_duval_t1(P_CH4, P_C2H4, P_C2H2, total):
+    """Duval Triangle 1: Uses CH4, C2H4, C2H2. Regions for D1, D2, T1, T2, T3, PD."""
+    if total == 0:
+        return DiagResult(NOT_APPLICABLE, NOT_APPLICABLE)
+    
+    diagnosis = classify_duval_t1(P_CH4, P_C2H4, P_C2H2)
+    return DiagResult(diagnosis, f"{diagnosis} (CH4: {P_CH4:.1f}%, C2H4: {P_C2H4:.1f}%, C2H2: {P_C2H2:.1f}%)")
+
+def diagnose_duval_t4(P_H2, P_C2H2, P_C2H4, total):
+    """Duval Triangle 4: Uses H2, C2H2, C2H4. Regions for T3, D2, S (Stray Gassing)."""
+    if total == 0:
+        return DiagResult(NOT_APPLICABLE, NOT_APPLICABLE)
+
+    diagnosis = classify_duval_t4(P_H2, P_C2H2, P_C2H4)
+    return DiagResult(diagnosis, f"{diagnosis} (H2: {P_H2:.1f}%, C2H2: {P_C2H2:.1f}%, C2H4: {P_C2H4:.1f}%)")
+
+def diagnose_rogers_ratio(R1, R2, R5):
+    """Rogers Ratio Method: Uses the 3 ratios (CH4/H2, C2H4/CH4, C2H2/C2H4) and a lookup table."""
+    # Rogers Code Lookup Table (Simplified, R1/R2/R5 limits are approx 0.1, 1, 3 for 0/1/2)
+    (d0, d1, d2), diag = classify_rogers(R1, R2, R5)
+    
+    return DiagResult(
+        diag,
+        f"Code: {d0}{d1}{d2}XX, Diagnosis: {diag} (R1:{R1:.2f}, R2:{R2:.2f}, R5:{R5:.2f})",
+        {'R1 (CH4/H2)': R1, 'R2 (C2H4/CH4)': R2, 'R5 (C2H2/C2H4)': R5},
+    )
+
+def diagnose_doernenburg(H2, CH4, C2H4, C2H2, R_ch4_h2, R_c2h2_c2h4, R_c2h2_ch4):
+    """Doernenburg's Method: Checks gas levels, then the ratios against specific limits."""
+    diagnosis = classify_doernenburg(H2, CH4, C2H4, C2H2, R_ch4_h2, R_c2h2_c2h4, R_c2h2_ch4)
+    ratios = {'CH4 / H2': R_ch4_h2, 'C2H2 / C2H4': R_c2h2_c2h4, 'C2H2 / CH4': R_c2h2_ch4}
+    if diagnosis == DOERNENBURG_INCONCLUSIVE:
+        return DiagResult(diagnosis, diagnosis, ratios)
+
+    return DiagResult(diagnosis, f"{diagnosis} (Check thresholds in plot tab)", ratios)
+
+def diagnose_duval_t5(P_CH4, P_C2H4, P_C2H2, total):
+    """Duval Triangle 5: Focuses on thermal fault differentiation in DGA-R4."""
+    if total == 0:
+        return DiagResult(NOT_APPLICABLE, NOT_APPLICABLE)
+
+    diagnosis = classify_duval_t5(P_CH4, P_C2H4, P_C2H2)
+    return DiagResult(diagnosis, f"{diagnosis} (CH4: {P_CH4:.1f}%, C2H4: {P_C2H4:.1f}%, C2H2: {P_C2H2:.1f}%)")
+
+def diagnose_duval_pentagon(P_H2, P_CH4, P_C2H6, P_C2H4, P_C2H2, total):
+    """Duval Pentagon Method: Provides a diagnosis based on the dominant gas percentage."""
+    if total == 0:
+        return DiagResult(PENTAGON_NOT_APPLICABLE, PENTAGON_NOT_APPLICABLE)
+
+    diagnosis = classify_pentagon(P_H2, P_CH4, P_C2H6, P_C2H4, P_C2H2)
+    return DiagResult(diagnosis, diagnosis)
+
+# 3. Summary Dispatch
+
+# Summary models: (result key, model label, diagnose function, compute_features or gas argument keys)
+DIAGNOSERS = [
+    ('duval_t1', "Duval's Triangle 1 (T1/T2/D1)", diagnose_duval_t1, ('p_t1_ch4', 'p_t1_c2h4', 'p_t1_c2h2', 't1_total')),
+    ('duval_t4', "Duval's Triangle 4 (T3/D2/S)", diagnose_duval_t4, ('p_t4_h2', 'p_t4_c2h2', 'p_t4_c2h4', 't4_total')),
+    ('rogers', "Rogers Ratio Method (R1/R2/R5)", diagnose_rogers_ratio, ('r_ch4_h2', 'r_c2h4_ch4', 'r_c2h2_c2h4')),
+    ('doernenburg', "Doernenburg’s Method", diagnose_doernenburg,
+     ('H2', 'CH4', 'C2H4', 'C2H2', 'r_ch4_h2', 'r_c2h2_c2h4', 'r_c2h2_ch4')),
+    ('pentagon', "Duval’s Pentagon", diagnose_duval_pentagon,
+     ('p_pent_h2', 'p_pent_ch4', 'p_pent_c2h6', 'p_pent_c2h4', 'p_pent_c2h2', 'pent_total')),
+]
+
+def run_analysis(inputs):
+    """Runs the summary models for one DGAInputs reading and returns {result key: DiagResult} in DIAGNOSERS order."""
+    values = dict(compute_features(*inputs), **dict(zip(GAS_COLUMNS, inputs)))
+    return {key: diagnose(*(values[name] for name in arg_keys)) for key, _, diagnose, arg_keys in DIAGNOSERS}
+
+# 4. Batch Analysis
+
+# Batch result columns: (dga_kernels.KERNEL_MODELS key, column, labels, label for a zero gas-group total)
+BATCH_MODELS = [
+    ('duval_t1', "Duval T1", DUVAL_T1_DIAGNOSES, NOT_APPLICABLE),
+    ('duval_t4', "Duval T4", DUVAL_T4_DIAGNOSES, NOT_APPLICABLE),
+    ('duval_t5', "Duval T5", DUVAL_T5_DIAGNOSES, NOT_APPLICABLE),
+    ('rogers', "Rogers", ROGERS_CODES.ravel(), NOT_APPLICABLE),
+    ('doernenburg', "Doernenburg", DOERNENBURG_DIAGNOSES, NOT_APPLICABLE),
+    ('pentagon', "Duval Pentagon", PENTAGON_DIAGNOSES, PENTAGON_NOT_APPLICABLE),
+]
+
+def batch_labels_numpy(inputs):
+    """Label arrays for a DGAInputs batch, in BATCH_MODELS order (NumPy fallback for dga_kernels.batch_labels_numba)."""
+    H2, CH4, C2H4, C2H2 = inputs.H2, inputs.CH4, inputs.C2H4, inputs.C2H2
+    f = compute_features_array(*inputs)
+    _, rogers = classify_rogers(f['r_ch4_h2'], f['r_c2h4_ch4'], f['r_c2h2_c2h4'])
+    return [
+        np.where(f['t1_total'] > 0, classify_duval_t1(f['p_t1_ch4'], f['p_t1_c2h4'], f['p_t1_c2h2']), NOT_APPLICABLE),
+        np.where(f['t4_total'] > 0, classify_duval_t4(f['p_t4_h2'], f['p_t4_c2h2'], f['p_t4_c2h4']), NOT_APPLICABLE),
+        np.where(f['t1_total'] > 0, classify_duval_t5(f['p_t1_ch4'], f['p_t1_c2h4'], f['p_t1_c2h2']), NOT_APPLICABLE),
+        rogers,
+        classify_doernenburg(H2, CH4, C2H4, C2H2, f['r_ch4_h2'], f['r_c2h2_c2h4'], f['r_c2h2_ch4']),
+        np.where(f['pent_total'] > 0, classify_pentagon(
+            f['p_pent_h2'], f['p_pent_ch4'], f['p_pent_c2h6'], f['p_pent_c2h4'], f['p_pent_c2h2']), PENTAGON_NOT_APPLICABLE),
+    ]
+
+# 5. Duval Triangle Plot Geometry
+
+def _precompute_regions(regions):
+    """Converts ternary region vertices to closed Cartesian polygons and label centroids (run once at import)."""
+    precomputed = {}
+    for name, region in regions.items():
+        xy = to_cartesian(region['coords'])
+        precomputed[name] = {
+            'fillcolor': region['fillcolor'],
+            'text_color': region['text_color'],
+            'xy': np.vstack((xy, xy[:1])),  # Closed polygon
+            'centroid': xy.mean(axis=0),
+        }
+    return precomputed
+
+# Duval T1 Fault Regions (P1=CH4, P2=C2H4, P3=C2H2) - Simplified Coordinates
+DUVAL_T1_REGIONS = {
+    'PD': {'fillcolor': 'rgba(173, 216, 230, 0.3)', 'text_color': 'blue', 'coords': [(98, 2, 0), (90, 0, 10), (95, 0, 5), (100, 0, 0)]},
+    'T1': {'fillcolor': 'rgba(144, 238, 144, 0.3)', 'text_color': 'green', 'coords': [(90, 0, 10), (70, 0, 30), (80, 20, 0), (98, 2, 0)]},
+    'T2': {'fillcolor': 'rgba(255, 255, 0, 0.3)', 'text_color': 'darkgoldenrod', 'coords': [(70, 0, 30), (50, 0, 50), (40, 60, 0), (80, 20, 0)]},
+    'T3': {'fillcolor': 'rgba(255, 165, 0, 0.3)', 'text_color': 'red', 'coords': [(40, 60, 0), (0, 100, 0), (0, 50, 50), (50, 0, 50)]},
+    'D2': {'fillcolor': 'rgba(250, 128, 114, 0.3)', 'text_color': 'darkred', 'coords': [(0, 100, 0), (0, 0, 100), (40, 60, 0)]},
+    'D1': {'fillcolor': 'rgba(128, 0, 128, 0.3)', 'text_color': 'white', 'coords': [(0, 50, 50), (0, 0, 100), (50, 0, 50)]},
+}
+
+# Duval T4 Fault Regions (P1=H2, P2=C2H2, P3=C2H4) - Simplified Coordinates
+DUVAL_T4_REGIONS = {
+    'S': {'fillcolor': 'rgba(211, 211, 211, 0.3)', 'text_color': 'black', 'coords': [(95, 5, 0), (70, 30, 0), (70, 0, 30), (95, 0, 5)]},
+    'T3': {'fillcolor': 'rgba(255, 215, 0, 0.3)', 'text_color': 'orange', 'coords': [(30, 0, 70), (0, 0, 100), (0, 30, 70), (30, 70, 0)]},
+    'D2': {'fillcolor': 'rgba(139, 0, 0, 0.3)', 'text_color': 'white', 'coords': [(0, 100, 0), (0, 70, 30), (30, 0, 70), (0, 0, 100)]},
+}
+
+DUVAL_T1_REGIONS_XY = _precompute_regions(DUVAL_T1_REGIONS)
+DUVAL_T4_REGIONS_XY = _precompute_regions(DUVAL_T4_REGIONS)
+
+# Base triangle (normalized to a 100-unit equilateral triangle) outline and corner label anchors
+TRIANGLE_OUTLINE_XY = to_cartesian([(100, 0, 0), (0, 100, 0), (0, 0, 100), (100, 0, 0)])  # C = (50, 86.6)
+TRIANGLE_CORNERS_XY = TRIANGLE_OUTLINE_XY[:3] + np.array([[0, -5], [0, -5], [0, 5]])
@@ -1,290 +1,206 @@
+import io
+
 import streamlit as st
-import matplotlib.pyplot as plt
 import numpy as np
-
-# --- DGA Model Logic (Based on IEC/IEEE Standards) ---
-
-# 1. Coordinate Conversion for Ternary Plots (Duval)
-def to_cartesian(p1, p2, p3):
-    """Converts normalized (100%) ternary coordinates to Cartesian (x, y) for plotting."""
-    x = p2 + p3 / 2
-    y = p3 * np.sqrt(3) / 2
-    return x, y
-
-def get_duval_percentages(G1, G2, G3):
-    """Normalizes three gases to 100%."""
-    total = G1 + G2 + G3
-    if total == 0:
-        return 0, 0, 0, 0
-    P1 = (G1 / total) * 100
-    P2 = (G2 / total) * 100
-    P3 = (G3 / total) * 100
-    return P1, P2, P3, total
-
-def get_pentagon_percentages(H2, CH4, C2H6, C2H4, C2H2):
-    """Normalizes the five key gases for the Pentagon plot (Total = sum of 5 gases)."""
-    gases = [H2, CH4, C2H6, C2H4, C2H2]
-    total = sum(gases)
-    if total == 0:
-        return [0] * 5, 0
-    
-    percentages = [(g / total) * 100 for g in gases]
-    return percentages, total
-
-# 2. Diagnostic Functions
-
-def diagnose_duval_t1(H2, CH4, C2H4, C2H2, CO, C2H6):
-    """Duval Triangle 1: Uses CH4, C2H4, C2H2. Regions for D1, D2, T1, T2, T3, PD."""
-    P_CH4, P_C2H4, P_C2H2, total = get_duval_percentages(CH4, C2H4, C2H2)
-    
-    if total == 0:
-        return "Not Applicable (Total gas is zero)"
-    
-    # Simple check for T1 region based on common boundaries (P_C2H2 < 0.5, P_CH4 > 80)
-    if P_C2H2 < 0.5 and P_CH4 > 80:
-        diagnosis = "T1 (Thermal fault T < 300°C)"
-    elif P_C2H4 > 25 and P_C2H2 < 1:
-        diagnosis = "T2 (Thermal fault 300°C–700°C)"
-    elif P_C2H2 > 5 and P_C2H4 > 15:
-        diagnosis = "D2 (Arcing in oil)"
-    elif P_C2H4 > 50 and P_C2H2 < 2:
-        diagnosis = "T3 (Thermal fault T > 700°C)"
+import pandas as pd
+import plotly.graph_objects as go
+
+from dga_models import (
+    BATCH_MODELS, DIAGNOSERS, DUVAL_T1_REGIONS_XY, DUVAL_T4_REGIONS_XY, GAS_COLUMNS, TRIANGLE_CORNERS_XY,
+    TRIANGLE_OUTLINE_XY, DGAInputs, batch_labels_numpy, compute_features, run_analysis, to_cartesian,
+)
+
+# --- Summary Table ---
+
+def get_analysis(inputs):
+    """Returns this session's analysis results for a DGAInputs reading, re-running the models only when it changes."""
+    analysis = st.session_state.get('analysis')
+    if analysis is None or analysis['inputs'] != inputs:
+        results = run_analysis(inputs)
+        analysis = st.session_state['analysis'] = {
+            'inputs': inputs, 'results': results, 'summary': build_results_df(results),
+            'doernenburg': build_doernenburg_df(results['doernenburg'].ratios),
+        }
+    return analysis
+
+def build_results_df(results):
+    """Returns the Model/Diagnosis summary DataFrame for run_analysis results."""
+    return pd.DataFrame([
+        {"Model": label, "Diagnosis": results[key].detail} for key, label, _, _ in DIAGNOSERS
+    ])
+
+def build_doernenburg_df(ratios):
+    """Returns the Doernenburg ratio/threshold table shown in the Doernenburg tab."""
+    return pd.DataFrame({
+        "Ratio": list(ratios),
+        "Value": list(ratios.values()),
+        "Threshold": ["> 1.0 (for T2)", "> 0.3 (for D1/D2)", "< 0.7 (for D1)"],
+    })
+
+# --- Batch Analysis (CSV upload) ---
+
+# Label given to every model column of a CSV row with a blank (NaN) or negative gas value
+BATCH_INVALID_ROW = "Invalid reading (blank or negative gas value)"
+
+@st.cache_data(max_entries=16)
+def batch_diagnose(df):
+    """Diagnoses every row of a DataFrame with GAS_COLUMNS (ppm); returns it with one label column per model."""
+    missing = [column for column in GAS_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"CSV is missing gas column(s): {', '.join(missing)}")
+
+    gases = df[GAS_COLUMNS].to_numpy(dtype=float)
+    valid = (gases >= 0).all(axis=1)  # False for NaN as well as negative values
+    gases = np.ascontiguousarray(gases[valid])
+    try:
+        # Imported lazily so numba is only loaded once a CSV is uploaded
+        from dga_kernels import batch_labels_numba
+    except ImportError:  # numba is optional; fall back to the NumPy classifiers
+        valid_labels = batch_labels_numpy(DGAInputs.from_columns(gases))
     else:
-        diagnosis = "Undefined/Mixed Fault"
-        
-    return f"{diagnosis} (CH4: {P_CH4:.1f}%, C2H4: {P_C2H4:.1f}%, C2H2: {P_C2H2:.1f}%)"
+        valid_labels = batch_labels_numba(gases)
 
-def diagnose_duval_t4(H2, CH4, C2H4, C2H2, CO, C2H6):
-    """Duval Triangle 4: Uses H2, C2H2, C2H4. Regions for T3, D2, S (Stray Gassing)."""
-    P_H2, P_C2H2, P_C2H4, total = get_duval_percentages(H2, C2H2, C2H4)
+    columns = {}
+    for (_, column, _, _), label in zip(BATCH_MODELS, valid_labels):
+        columns[column] = np.full(len(df), BATCH_INVALID_ROW, dtype=object)
+        columns[column][valid] = label
+    return df.assign(**columns)
 
-    if total == 0:
-        return "Not Applicable (Total gas is zero)"
+# --- Plotting Functions 
+# Plot functions return a figure (or PNG bytes); st.plotly_chart / st.image is called at the call site.
 
-    if P_H2 > 80 and P_C2H2 < 5:
-        diagnosis = "S (Stray Gassing / Hot metal contacts)"
-    elif P_C2H4 > 60 and P_H2 < 10:
-        diagnosis = "T3 (Severe Thermal Fault T > 700°C)"
-    elif P_C2H2 > 15:
-        diagnosis = "D2 (High Energy Arcing)"
-    else:
-        diagnosis = "Mixed or Undefined Region"
-        
-    return f"{diagnosis} (H2: {P_H2:.1f}%, C2H2: {P_C2H2:.1f}%, C2H4: {P_C2H4:.1f}%)"
-
-def diagnose_rogers_ratio(H2, CH4, C2H4, C2H2, CO, C2H6):
-    """Rogers Ratio Method: Calculates 3 ratios and uses lookup table."""
-    ratios = {
-        'R1': CH4 / H2 if H2 > 0 else 99,
-        'R2': C2H4 / CH4 if CH4 > 0 else 99,
-        'R5': C2H2 / C2H4 if C2H4 > 0 else 99,
-    }
+def draw_duval_triangle_plot(G1_name, G2_name, G3_name, fault_regions, title):
+    """Builds the static Duval triangle figure; its last trace is the input marker (see update_duval_point)."""
+    fig = go.Figure()
 
-    # Rogers Code Lookup Table (Simplified, R1/R2/R5 limits are approx 0.1, 1, 3 for 0/1/2)
-    code = ""
-    code += '0' if ratios['R1'] < 0.1 else ('2' if ratios['R1'] > 1.0 else '1')
-    code += '0' if ratios['R2'] < 1.0 else ('2' if ratios['R2'] > 3.0 else '1')
-    code += '0' if ratios['R5'] < 0.5 else ('2' if ratios['R5'] > 3.0 else '1')
-    
-    # Common codes and their diagnoses
-    diagnoses = {
-        '100': "T1 (Thermal Fault T < 300°C)",
-        '110': "T2 (Thermal Fault 300°C–700°C)",
-        '210': "T3 (Thermal Fault T > 700°C)",
-        '102': "D1 (Low Energy Discharge/PD)",
-        '001': "D2 (High Energy Discharge/Arcing)",
-        '000': "No fault / Normal aging",
-        '010': "Undefined/Mixed thermal",
-        '011': "Undefined/Mixed thermal",
-        '111': "Mixed thermal and electrical",
-    }
-    
-    diag = diagnoses.get(code, "Undefined/Developing Fault")
-    
-    return f"Code: {code}XX, Diagnosis: {diag} (R1:{ratios['R1']:.2f}, R2:{ratios['R2']:.2f}, R5:{ratios['R5']:.2f})"
-
-def diagnose_doernenburg(H2, CH4, C2H4, C2H2, CO, C2H6):
-    """Doernenburg's Method: Checks four ratios against specific limits."""
-    # Doernenburg only applicable if certain gas levels are met (simplified condition here)
-    if H2 < 100 or CH4 < 10 or C2H2 < 0.5 or C2H4 < 50:
-        return "Inconclusive (Gas limits below Doernenburg thresholds)"
-
-    ratios = {
-        'R_ch4_h2': CH4 / H2,
-        'R_c2h2_c2h4': C2H2 / C2H4,
-        'R_c2h2_ch4': C2H2 / CH4,
-        'R_c2h2_h2': C2H2 / H2,
+    # 1. Draw Regions (closed Cartesian polygons precomputed once in dga_models)
+    for name, region in fault_regions.items():
+        fig.add_trace(go.Scatter(
+            x=region['xy'][:, 0], y=region['xy'][:, 1], mode='lines', fill='toself', name=name,
+            fillcolor=region['fillcolor'], line=dict(color='gray', dash='dash', width=0.5),
+            hoverinfo='name',
+        ))
+
+    # Region labels (centered, simplified) as a single text trace
+    centroids = np.array([region['centroid'] for region in fault_regions.values()])
+    fig.add_trace(go.Scatter(
+        x=centroids[:, 0], y=centroids[:, 1], mode='text', text=[f"<b>{name}</b>" for name in fault_regions],
+        textfont=dict(size=11, color=[region['text_color'] for region in fault_regions.values()]), hoverinfo='skip',
+    ))
+
+    # 2. Plot the base triangle outline
+    fig.add_trace(go.Scatter(
+        x=TRIANGLE_OUTLINE_XY[:, 0], y=TRIANGLE_OUTLINE_XY[:, 1], mode='lines',
+        line=dict(color='black', width=2), hoverinfo='skip',
+    ))
+
+    # 3. Placeholder for the User's Data Point (must stay the last trace; moved by update_duval_point)
+    fig.add_trace(go.Scatter(
+        x=[], y=[], mode='markers+text', name='Input Point', textposition='bottom center',
+        marker=dict(color='red', size=12, line=dict(color='black', width=1)),
+        textfont=dict(size=10, color='red'), hoverinfo='text',
+    ))
+
+    # 4. Labels and Cosmetics: corner labels, then the zero-gas notice (last annotation, hidden by default)
+    for (x, y), gas_name in zip(TRIANGLE_CORNERS_XY, (G1_name, G2_name, G3_name)):
+        fig.add_annotation(x=x, y=y, text=f"<b>{gas_name} (100%)</b>", showarrow=False, font=dict(size=13, color='black'))
+    fig.add_annotation(x=50, y=40, text="Total Gas Concentration is Zero", showarrow=False, font=dict(size=16), visible=False)
+
+    fig.update_layout(
+        title=dict(text=f"<b>{title}</b>", x=0.5, xanchor='center'),
+        showlegend=False, plot_bgcolor='white', height=600, margin=dict(l=20, r=20, t=60, b=20),
+        xaxis=dict(range=[-5, 105], visible=False),
+        yaxis=dict(range=[-5, 95], visible=False, scaleanchor='x'),  # Keep the triangle equilateral
+    )
+    return fig
+
+# Static description of each Duval triangle figure: corner gas names, regions and title
+DUVAL_TRIANGLE_SPECS = {
+    't1': (("CH4", "C2H4", "C2H2"), DUVAL_T1_REGIONS_XY, "Duval Triangle 1 (T1, T2, D1, D2, PD)"),
+    't4': (("H2", "C2H2", "C2H4"), DUVAL_T4_REGIONS_XY, "Duval Triangle 4 (T3, D2, S)"),
+}
+
+@st.cache_resource
+def build_duval_backgrounds():
+    """Builds the static Duval triangle figures (regions, labels, outline) once per process; never modified."""
+    return {
+        name: {'fig': draw_duval_triangle_plot(*gas_names, fault_regions, title), 'title': title, 'names': gas_names}
+        for name, (gas_names, fault_regions, title) in DUVAL_TRIANGLE_SPECS.items()
     }
 
-    # Simplified Diagnosis Logic
-    if ratios['R_c2h2_c2h4'] > 0.3 and ratios['R_c2h2_ch4'] < 0.7:
-        diagnosis = "D1 (Discharge/Arcing)"
-    elif ratios['R_c2h2_c2h4'] < 0.3 and ratios['R_ch4_h2'] > 1.0:
-        diagnosis = "T2 (Thermal fault 300°C–700°C)"
+def get_duval_triangle_fig(key):
+    """Returns this session's copy of the Duval triangle plot for key ('t1' or 't4')."""
+    figures = st.session_state.setdefault('duval_figures', {})
+    if key not in figures:
+        template = build_duval_backgrounds()[key]
+        figures[key] = dict(template, fig=go.Figure(template['fig']))
+    return figures[key]
+
+def update_duval_point(plot, P1, P2, P3, total):
+    """Moves the input marker on a session's Duval triangle figure and returns the figure."""
+    has_gas = total > 0
+    G1_name, G2_name, G3_name = plot['names']
+    fig = plot['fig']
+    marker = fig.data[-1]
+
+    marker.visible = has_gas
+    fig.layout.annotations[-1].visible = not has_gas
+
+    if has_gas:
+        user_x, user_y = to_cartesian((P1, P2, P3))
+        marker.x, marker.y = [user_x], [user_y]
+        marker.text = [f'<b>({G1_name}:{P1:.0f}, {G2_name}:{P2:.0f}, {G3_name}:{P3:.0f})</b>']
+        fig.layout.title.text = f"<b>{plot['title']}</b>"
     else:
-        diagnosis = "Mixed/Other fault"
-        
-    return f"{diagnosis} (Check thresholds in plot tab)"
-
-def diagnose_duval_t5(H2, CH4, C2H4, C2H2, CO, C2H6):
-    """Duval Triangle 5: Focuses on thermal fault differentiation in DGA-R4."""
-    P_CH4, P_C2H4, P_C2H2, total = get_duval_percentages(CH4, C2H4, C2H2)
-    
-    if total == 0:
-        return "Not Applicable (Total gas is zero)"
-
-    # Simplified T5 Logic (Focus on T2, C, HC)
-    if P_C2H4 > 50 and P_CH4 > 40:
-        diagnosis = "HC (Hot cellulosic materials)"
-    elif P_CH4 > 70 and P_C2H4 < 10:
-        diagnosis = "T1 (Thermal T < 300°C - Cellulose/Paper)"
-    elif P_C2H4 > 30 and P_C2H2 < 1:
-        diagnosis = "T2 (Thermal T 300°C–770°C)"
-    else:
-        diagnosis = "Mixed Oil Fault"
-        
-    return f"{diagnosis} (CH4: {P_CH4:.1f}%, C2H4: {P_C2H4:.1f}%, C2H2: {P_C2H2:.1f}%)"
-
-def diagnose_duval_pentagon(H2, CH4, C2H4, C2H2, CO, C2H6):
-    """Duval Pentagon Method: Provides a diagnosis based on the dominant gas percentage."""
-    
-    # Use the 5 gases for the pentagon
-    P_gases, total = get_pentagon_percentages(H2, CH4, C2H6, C2H4, C2H2)
-    if total == 0:
-        return "Not Applicable (Total pentagon gases is zero)"
-
-    P_H2, P_CH4, P_C2H6, P_C2H4, P_C2H2 = P_gases
-    
-    # Simple rule-based diagnosis based on high dominance
-    if P_H2 > 40 and P_C2H2 < 10:
-        diagnosis = "PD (Partial Discharge) or D1 (Low Energy Discharge)"
-    elif P_C2H2 > 30:
-        diagnosis = "D2 (High Energy Arcing)"
-    elif P_C2H4 > 50:
-        diagnosis = "T3 (Severe Thermal Fault T > 700°C)"
-    elif P_C2H6 > 40 and P_CH4 < 20:
-        diagnosis = "T1 (Low Temperature Thermal Fault T < 300°C)"
-    elif P_CH4 > 50:
-        diagnosis = "T2 (Medium Temperature Thermal Fault 300°C–700°C)"
-    else:
-        diagnosis = "Mixed/Developing Fault Zone (Refer to plot)"
-        
-    return diagnosis
-
-# --- Plotting Functions 
-
-def draw_duval_triangle_plot(fig, ax, G1_name, G2_name, G3_name, P1, P2, P3, fault_regions, title):
-    """Draws a generic Duval triangle plot."""
-    
-    # 1. Base Triangle Coordinates (Normalized to a 100-unit equilateral triangle)
-    A = (0, 0)
-    B = (100, 0)
-    C = to_cartesian(0, 50, 100) # (50, 86.6)
-    
-    # 2. Draw Regions (using simplified convex hulls/polygons)
-    for name, region in fault_regions.items():
-        # Points are defined in normalized (P1, P2, P3) format
-        x_coords = []
-        y_coords = []
-        for p_val1, p_val2, p_val3 in region['coords']:
-            x, y = to_cartesian(p_val1, p_val2, p_val3)
-            x_coords.append(x)
-            y_coords.append(y)
-        
-        # Close the polygon
-        x_coords.append(x_coords[0])
-        y_coords.append(y_coords[0])
-
-        ax.plot(x_coords, y_coords, color='gray', linestyle='--', linewidth=0.5)
-        ax.fill(x_coords, y_coords, color=fault_regions[name]['color'], alpha=0.3, zorder=1)
-        
-        # Add label (centered, simplified)
-        x_center = np.mean(x_coords[:-1])
-        y_center = np.mean(y_coords[:-1])
-        ax.text(x_center, y_center, name, ha='center', va='center', fontsize=8, weight='bold', color=fault_regions[name]['text_color'])
+        fig.layout.title.text = f"<b>{plot['title'].split(' (')[0]} - No Gas Input</b>"
 
-    # 3. Plot the base triangle outline
-    ax.plot([A[0], B[0], C[0], A[0]], [A[1], B[1], C[1], A[1]], 'k-', linewidth=2)
+    return fig
 
-    # 4. Plot the User's Data Point
-    user_x, user_y = to_cartesian(P1, P2, P3)
-    ax.plot(user_x, user_y, 'o', color='red', markersize=10, label=f'Input Point', zorder=5, markeredgecolor='black')
-    ax.text(user_x, user_y - 8, f'({G1_name}:{P1:.0f}, {G2_name}:{P2:.0f}, {G3_name}:{P3:.0f})', 
-            ha='center', fontsize=7, color='red', weight='bold')
 
-    # 5. Labels and Cosmetics
-    ax.set_title(title, fontsize=12, fontweight='bold')
+def plot_duval_t1(inputs):
+    """Generates the Duval T1 Plot for a DGAInputs reading and returns the Plotly figure (rendered by the caller)."""
+    plot = get_duval_triangle_fig('t1')
     
-    # Corner Labels
-    ax.text(A[0], A[1] - 5, G1_name + " (100%)", ha='center', fontsize=10, weight='bold')
-    ax.text(B[0], B[1] - 5, G2_name + " (100%)", ha='center', fontsize=10, weight='bold')
-    ax.text(C[0], C[1] + 5, G3_name + " (100%)", ha='center', fontsize=10, weight='bold')
-
-    ax.set_xlim(-5, 105)
-    ax.set_ylim(-5, 95)
-    ax.axis('off') # Remove axis ticks and frame
-    ax.set_aspect('equal', adjustable='box')
+    f = compute_features(*inputs)
 
+    return update_duval_point(plot, f['p_t1_ch4'], f['p_t1_c2h4'], f['p_t1_c2h2'], f['t1_total'])
 
-def plot_duval_t1(H2, CH4, C2H4, C2H2, CO, C2H6):
-    """Generates the Duval T1 Plot."""
-    fig, ax = plt.subplots(figsize=(6, 6))
+def plot_duval_t4(inputs):
+    """Generates the Duval T4 Plot for a DGAInputs reading and returns the Plotly figure (rendered by the caller)."""
+    plot = get_duval_triangle_fig('t4')
     
-    P_CH4, P_C2H4, P_C2H2, total = get_duval_percentages(CH4, C2H4, C2H2)
-
-    # Duval T1 Fault Regions (P1=CH4, P2=C2H4, P3=C2H2) - Simplified Coordinates for Matplotlib
-    regions = {
-        'PD': {'color': 'lightblue', 'text_color': 'blue', 'coords': [(98, 2, 0), (90, 0, 10), (95, 0, 5), (100, 0, 0)]},
-        'T1': {'color': 'lightgreen', 'text_color': 'green', 'coords': [(90, 0, 10), (70, 0, 30), (80, 20, 0), (98, 2, 0)]},
-        'T2': {'color': 'yellow', 'text_color': 'darkgoldenrod', 'coords': [(70, 0, 30), (50, 0, 50), (40, 60, 0), (80, 20, 0)]},
-        'T3': {'color': 'orange', 'text_color': 'red', 'coords': [(40, 60, 0), (0, 100, 0), (0, 50, 50), (50, 0, 50)]},
-        'D2': {'color': 'salmon', 'text_color': 'darkred', 'coords': [(0, 100, 0), (0, 0, 100), (40, 60, 0)]},
-        'D1': {'color': 'purple', 'text_color': 'white', 'coords': [(0, 50, 50), (0, 0, 100), (50, 0, 50)]},
-    }
+    f = compute_features(*inputs)
 
-    if total > 0:
-        draw_duval_triangle_plot(fig, ax, "CH4", "C2H4", "C2H2", P_CH4, P_C2H4, P_C2H2, regions, "Duval Triangle 1 (T1, T2, D1, D2, PD)")
-    else:
-        ax.set_title("Duval Triangle 1 - No Gas Input")
-        ax.text(50, 50, "Total Gas Concentration is Zero", ha='center', fontsize=12)
+    return update_duval_point(plot, f['p_t4_h2'], f['p_t4_c2h2'], f['p_t4_c2h4'], f['t4_total'])
 
-    st.pyplot(fig)
+# savefig options for matplotlib figures shown with st.image (the same defaults st.pyplot uses)
+PNG_SAVEFIG_KWARGS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
 
-def plot_duval_t4(H2, CH4, C2H4, C2H2, CO, C2H6):
-    """Generates the Duval T4 Plot."""
-    fig, ax = plt.subplots(figsize=(6, 6))
-    
-    P_H2, P_C2H2, P_C2H4, total = get_duval_percentages(H2, C2H2, C2H4)
-    
-    # Duval T4 Fault Regions (P1=H2, P2=C2H2, P3=C2H4) - Simplified Coordinates
-    regions = {
-        'S': {'color': 'lightgray', 'text_color': 'black', 'coords': [(95, 5, 0), (70, 30, 0), (70, 0, 30), (95, 0, 5)]},
-        'T3': {'color': 'gold', 'text_color': 'orange', 'coords': [(30, 0, 70), (0, 0, 100), (0, 30, 70), (30, 70, 0)]},
-        'D2': {'color': 'darkred', 'text_color': 'white', 'coords': [(0, 100, 0), (0, 70, 30), (30, 0, 70), (0, 0, 100)]},
-    }
-
-    if total > 0:
-        draw_duval_triangle_plot(fig, ax, "H2", "C2H2", "C2H4", P_H2, P_C2H2, P_C2H4, regions, "Duval Triangle 4 (T3, D2, S)")
-    else:
-        ax.set_title("Duval Triangle 4 - No Gas Input")
-        ax.text(50, 50, "Total Gas Concentration is Zero", ha='center', fontsize=12)
-
-    st.pyplot(fig)
+def _figure_png(fig):
+    """Renders a matplotlib Figure to PNG bytes."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **PNG_SAVEFIG_KWARGS)
+    return buffer.getvalue()
 
+@st.cache_data(max_entries=128)
 def plot_duval_pentagon(H2, CH4, C2H4, C2H2, CO, C2H6):
-    """Generates the Duval Pentagon Plot using polar projection."""
-    fig, ax = plt.subplots(figsize=(7, 7), subplot_kw=dict(polar=True))
+    """Generates the Duval Pentagon Plot using polar projection and returns it as PNG bytes."""
+    from matplotlib.figure import Figure  # Imported lazily; only the pentagon view uses matplotlib
+
+    fig = Figure(figsize=(7, 7))
+    ax = fig.subplots(subplot_kw=dict(polar=True))
     
     # 1. Prepare Data
     # Gases for Pentagon: H2, CH4, C2H6, C2H4, C2H2
-    P_gases, total = get_pentagon_percentages(H2, CH4, C2H6, C2H4, C2H2)
+    f = compute_features(H2, CH4, C2H4, C2H2, CO, C2H6)
+    P_gases = [f['p_pent_h2'], f['p_pent_ch4'], f['p_pent_c2h6'], f['p_pent_c2h4'], f['p_pent_c2h2']]
+    total = f['pent_total']
     
     categories = ['H2', 'CH4', 'C2H6', 'C2H4', 'C2H2']
     num_vars = len(categories)
     
-    # Angles for each axis (starting H2 at 90 deg / pi/2)
+    # Angles for each axis (H2 at 0; set_theta_offset below puts 0 at the top)
     angles = np.linspace(0, 2 * np.pi, num_vars, endpoint=False)
-    angles += np.pi / 2 # Shift to start H2 at the top
     
     # Complete the circle for plotting the shape
     angles = np.concatenate((angles, [angles[0]]))
@@ -315,11 +231,12 @@ def plot_duval_pentagon(H2, CH4, C2H4, C2H2, CO, C2H6):
     }
     
     for name, region in regions_coords.items():
-        # Plot a simplified point at 50% radius to represent the region center/marker
-        ax.plot(angles[:-1][categories.index(region['text'])], 50, 
+        # Plot a simplified point at 50% radius on the axis of the region's dominant gas
+        marker_angle = angles[np.argmax(region['coords'])]
+        ax.plot(marker_angle, 50, 
                 marker='s', markersize=12, color=region['color'], alpha=0.6,
                 label=name, markeredgecolor='black', zorder=2)
-        ax.text(angles[:-1][categories.index(region['text'])], 50, region['text'], 
+        ax.text(marker_angle, 50, region['text'], 
                 ha='center', va='center', fontsize=7, weight='bold', color='black', zorder=3)
 
     # 4. Plot the User's Data Point
@@ -334,34 +251,60 @@ def plot_duval_pentagon(H2, CH4, C2H4, C2H2, CO, C2H6):
     # Add a legend
     ax.legend(loc='lower left', bbox_to_anchor=(1.05, 0.5), fontsize=9)
 
-    st.pyplot(fig)
+    return _figure_png(fig)
+
+
+# --- Static Markdown Content ---
+
+# Dashboard views, in display order
+DASHBOARD_VIEWS = ["Duval T1", "Duval T4", "Rogers Ratios", "Doernenburg", "Duval Pentagon"]
+
+APP_CSS = """
+<style>
+.reportview-container .main {
+    padding-top: 2rem;
+}
+.stNumberInput {
+    border-radius: 0.5rem;
+    padding: 10px;
+}
+.stNumberInput label {
+    font-weight: 600;
+}
+</style>
+"""
+
+DUVAL_T1_KEY_MD = """
+**Diagnosis Key:**
+- **PD**: Partial Discharge
+- **T1**: Thermal Fault T < 300°C
+- **T2/T3**: Thermal Fault (medium to high temp)
+- **D1/D2**: Discharge/Arcing
+"""
+
+DUVAL_T4_KEY_MD = """
+**Diagnosis Key (High-temperature focus):**
+- **T3**: Severe Thermal Fault T > 700°C
+- **D2**: High Energy Arcing
+- **S**: Stray Gassing / Hot metal contacts
+"""
+
+ROGERS_NOTE_MD = "Rogers method uses fixed ranges for three ratios (R1, R2, R5) to derive a diagnostic code."
+
+DOERNENBURG_NOTE_MD = "Doernenburg requires specific minimum gas levels to be applicable."
+
+PENTAGON_NOTE_MD = """
+The Duval Pentagon plots the concentration percentages of the five fault gases ($\text{H}_2, \text{CH}_4, \text{C}_2\text{H}_6, \text{C}_2\text{H}_4, \text{C}_2\text{H}_2$) on a polar chart. 
+The shape formed by the input data determines the fault type based on which gas axis is most dominant.
+"""
 
 
 # --- Streamlit Application Layout ---
 
 st.set_page_config(layout="wide", page_title="DGA Transformer Fault Portal")
 
-st.markdown("""
-    <style>
-    .reportview-container .main {
-        padding-top: 2rem;
-    }
-    .stNumberInput, .stTabs {
-        border-radius: 0.5rem;
-        padding: 10px;
-    }
-    .stNumberInput label {
-        font-weight: 600;
-    }
-    /* Style for the summary table header */
-    .stTable > table > thead > tr > th {
-        background-color: #f0f2f6;
-        color: #1e3a8a;
-        font-size: 1.0rem;
-        font-weight: bold;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+# Injected on every run: Streamlit drops any element a rerun does not re-emit
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 st.title("⚡ Distribution Transformer DGA Fault Analysis Portal")
 st.caption("Enter the gas concentrations (in ppm) below and click 'Analyze' to generate a comprehensive fault diagnosis.")
@@ -391,8 +334,8 @@ with st.sidebar:
         # NEW INPUT ADDED: Ethane
         C2H6 = st.number_input("Ethane (C2H6)", min_value=0.0, value=50.0, step=1.0, key="input_C2H6")
 
-    # Update gas_data dictionary to include C2H6
-    gas_data = {'H2': H2, 'CH4': CH4, 'C2H4': C2H4, 'C2H2': C2H2, 'CO': CO, 'C2H6': C2H6}
+    # The reading as one object; cached scalar functions get *inputs
+    inputs = DGAInputs(H2, CH4, C2H4, C2H2, CO, C2H6)
     
     st.markdown("---")
     
@@ -407,101 +350,80 @@ with st.sidebar:
     
     st.markdown("---")
     # TCG calculation now includes C2H6
-    total_gases = sum([H2, CH4, C2H4, C2H2, CO, C2H6])
+    total_gases = sum(inputs)
     st.metric("Total Combustible Gas (TCG)", f"{total_gases:,.1f} ppm", help="Sum of H2, CH4, C2H4, C2H2, CO, C2H6")
+
+    st.markdown("---")
+    # Batch analysis: one DGA reading per row, diagnosed independently of the inputs above
+    batch_file = st.file_uploader(
+        "Upload CSV (batch analysis)", type="csv", key="batch_csv",
+        help="One reading per row with columns " + ", ".join(GAS_COLUMNS) + " (ppm)",
+    )
     
 # --- Main Content: Conditional Summary and Dashboard ---
 
-if st.session_state.analyzed:
+if st.session_state.analyzed and total_gases == 0:
+    # Nothing to diagnose: skip every model and figure
+    st.warning("All gas concentrations are zero. Enter at least one non-zero gas value (ppm) to run the fault analysis.")
+
+elif st.session_state.analyzed:
     
     st.header("Fault Analysis Summary")
 
-    # Run only the specified diagnostic models
-    analysis_results = [
-        {"Model": "Duval's Triangle 1 (T1/T2/D1)", "Diagnosis": diagnose_duval_t1(**gas_data)},
-        {"Model": "Duval's Triangle 4 (T3/D2/S)", "Diagnosis": diagnose_duval_t4(**gas_data)},
-        {"Model": "Rogers Ratio Method (R1/R2/R5)", "Diagnosis": diagnose_rogers_ratio(**gas_data)},
-        {"Model": "Doernenburg’s Method", "Diagnosis": diagnose_doernenburg(**gas_data)},
-        {"Model": "Duval’s Pentagon", "Diagnosis": diagnose_duval_pentagon(**gas_data)},
-    ]
+    # Run only the specified diagnostic models (once; the views below reuse these results)
+    analysis = get_analysis(inputs)
+    results = analysis['results']
 
     # Display the summary table
-    st.table(analysis_results)
+    st.dataframe(analysis['summary'], hide_index=True, use_container_width=True)
 
     st.header("Diagnostic Model Dashboard")
     st.info("The red marker on the plots shows your input data point. The regions/markers indicate common fault types.")
 
-    # --- Tabbed Dashboard (Only including the requested tabs) ---
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "Duval T1", 
-        "Duval T4", 
-        "Rogers Ratios", 
-        "Doernenburg",
-        "Duval Pentagon"]) # Tab name updated
+    # --- Dashboard View (Only including the requested views) ---
+    # A radio rather than st.tabs, so only the selected view's plot is built
+    view = st.radio("View", DASHBOARD_VIEWS, horizontal=True, key="active_view")
 
-    with tab1:
+    if view == "Duval T1":
         st.subheader("Duval Triangle 1: CH4 / C2H4 / C2H2")
-        plot_duval_t1(**gas_data)
-        st.markdown("""
-            **Diagnosis Key:**
-            - **PD**: Partial Discharge
-            - **T1**: Thermal Fault T < 300°C
-            - **T2/T3**: Thermal Fault (medium to high temp)
-            - **D1/D2**: Discharge/Arcing
-        """)
-
-    with tab2:
+        st.plotly_chart(plot_duval_t1(inputs), use_container_width=True)
+        st.markdown(DUVAL_T1_KEY_MD)
+
+    elif view == "Duval T4":
         st.subheader("Duval Triangle 4: H2 / C2H2 / C2H4")
-        plot_duval_t4(**gas_data)
-        st.markdown("""
-            **Diagnosis Key (High-temperature focus):**
-            - **T3**: Severe Thermal Fault T > 700°C
-            - **D2**: High Energy Arcing
-            - **S**: Stray Gassing / Hot metal contacts
-        """)
-
-    with tab3:
+        st.plotly_chart(plot_duval_t4(inputs), use_container_width=True)
+        st.markdown(DUVAL_T4_KEY_MD)
+
+    elif view == "Rogers Ratios":
         st.subheader("Rogers Ratio Method")
-        st.text(f"Diagnosis: {diagnose_rogers_ratio(**gas_data)}")
+        st.text(f"Diagnosis: {results['rogers'].detail}")
         
-        # Recalculating ratios just for display consistency
-        ratios = {
-            'R1 (CH4/H2)': gas_data['CH4'] / gas_data['H2'] if gas_data['H2'] > 0 else float('inf'),
-            'R2 (C2H4/CH4)': gas_data['C2H4'] / gas_data['CH4'] if gas_data['CH4'] > 0 else float('inf'),
-            'R5 (C2H2/C2H4)': gas_data['C2H2'] / gas_data['C2H4'] if gas_data['C2H4'] > 0 else float('inf'),
-        }
-        
-        st.bar_chart(ratios, color='#1e3a8a')
-        st.markdown("Rogers method uses fixed ranges for three ratios (R1, R2, R5) to derive a diagnostic code.")
+        # Same ratios the diagnosis used (99 when the denominator is zero, the Rogers convention)
+        st.bar_chart(results['rogers'].ratios, color='#1e3a8a')
+        st.markdown(ROGERS_NOTE_MD)
 
-    with tab4:
+    elif view == "Doernenburg":
         st.subheader("Doernenburg’s Method")
-        st.text(f"Diagnosis: {diagnose_doernenburg(**gas_data)}")
+        st.text(f"Diagnosis: {results['doernenburg'].detail}")
         
-        ratios_doernenburg = [
-            {"Ratio": "CH4 / H2", "Value": gas_data['CH4'] / gas_data['H2'] if gas_data['H2'] > 0 else float('inf'), "Threshold": "> 1.0 (for T2)"},
-            {"Ratio": "C2H2 / C2H4", "Value": gas_data['C2H2'] / gas_data['C2H4'] if gas_data['C2H4'] > 0 else float('inf'), "Threshold": "> 0.3 (for D1/D2)"},
-            {"Ratio": "C2H2 / CH4", "Value": gas_data['C2H2'] / gas_data['CH4'] if gas_data['CH4'] > 0 else float('inf'), "Threshold": "< 0.7 (for D1)"},
-        ]
-        st.dataframe(ratios_doernenburg, hide_index=True)
-        st.markdown("Doernenburg requires specific minimum gas levels to be applicable.")
-
-    with tab5:
-        st.subheader("Duval Pentagon Plot (H2, CH4, C2H6, C2H4, C2H2)")
-        plot_duval_pentagon(**gas_data)
-        st.code(f"Pentagon Diagnosis (Rule-based): {diagnose_duval_pentagon(**gas_data)}")
-        st.markdown("""
-            The Duval Pentagon plots the concentration percentages of the five fault gases ($\text{H}_2, \text{CH}_4, \text{C}_2\text{H}_6, \text{C}_2\text{H}_4, \text{C}_2\text{H}_2$) on a polar chart. 
-            The shape formed by the input data determines the fault type based on which gas axis is most dominant.
-            """)
+        st.dataframe(analysis['doernenburg'], hide_index=True)
+        st.markdown(DOERNENBURG_NOTE_MD)
 
+    elif view == "Duval Pentagon":
+        st.subheader("Duval Pentagon Plot (H2, CH4, C2H6, C2H4, C2H2)")
+        st.image(plot_duval_pentagon(*inputs), use_container_width=True)
+        st.code(f"Pentagon Diagnosis (Rule-based): {results['pentagon'].detail}")
+        st.markdown(PENTAGON_NOTE_MD)
 
 else:
     st.info("Input your DGA gas concentrations (ppm) in the sidebar on the left and click 'Analyze DGA Data' to view the full fault analysis dashboard.")
 
+if batch_file is not None:
+    st.header("Batch Analysis")
+    try:
+        st.dataframe(batch_diagnose(pd.read_csv(batch_file)), hide_index=True, use_container_width=True)
+    except ValueError as error:  # Unreadable CSV or missing gas columns
+        st.error(f"Could not analyze the uploaded CSV: {error}")
 
 st.markdown("---")
 st.markdown("Developed for Utility Operators to rapidly assess DGA results.")
-
-# Reset matplotlib settings to default after Streamlit uses them
-plt.rcdefaults()
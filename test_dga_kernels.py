@@ -0,0 +1,40 @@
+"""Parity checks between the numba batch kernel (dga_kernels) and the NumPy batch classifiers (dga_models)."""
+import itertools
+
+import numpy as np
+import pytest
+
+pytest.importorskip("numba")
+
+from dga_kernels import KERNEL_MODELS, batch_labels_numba  # noqa: E402
+from dga_models import BATCH_MODELS, DGAInputs, batch_labels_numpy  # noqa: E402
+
+# Gas levels (ppm) that put group percentages, ratios and the Doernenburg limits on or next to a threshold
+GRID_VALUES = (0, 0.5, 1, 2, 5, 10, 15, 19.5, 20, 25, 30, 40, 50, 60, 70, 80, 100, 200)
+C2H6_VALUES = (0, 20, 40, 100)
+
+
+def assert_same_labels(gases):
+    """Asserts both batch paths label every (N, 6) GAS_COLUMNS row the same, per BATCH_MODELS column."""
+    numba_labels = batch_labels_numba(gases)
+    numpy_labels = batch_labels_numpy(DGAInputs.from_columns(gases))
+    for (_, column, _, _), fast, reference in zip(BATCH_MODELS, numba_labels, numpy_labels):
+        mismatched = np.flatnonzero(fast != reference)
+        assert mismatched.size == 0, f"{column}: {mismatched.size} mismatches, first at {gases[mismatched[0]].tolist()}"
+
+
+def test_batch_models_follow_kernel_column_order():
+    assert tuple(key for key, _, _, _ in BATCH_MODELS) == KERNEL_MODELS
+
+
+def test_kernel_matches_numpy_on_threshold_grid():
+    # (H2, CH4, C2H4, C2H2, C2H6) combinations; CO (column 4) is not used by any rule
+    grid = np.array(list(itertools.product(GRID_VALUES, GRID_VALUES, GRID_VALUES, GRID_VALUES, C2H6_VALUES)), dtype=float)
+    assert_same_labels(np.insert(grid, 4, 0.0, axis=1))
+
+
+def test_kernel_matches_numpy_on_random_readings():
+    rng = np.random.default_rng(0)
+    gases = rng.uniform(0, 500, size=(50_000, 6)).round(1)
+    gases[rng.random(gases.shape) < 0.3] = 0.0  # Zero gases, including all-zero gas groups
+    assert_same_labels(gases)